@@ -0,0 +1,151 @@
+# benchmarks/bench_batching.py
+#
+# Compare per-item and micro-batched consumers: throughput on a synthetic
+# trade burst, then enqueue -> spread-update latency with a paced producer
+# at a few arrival rates (the quiet-traffic case batching must not hurt).
+# Run from the repo root:  python -m benchmarks.bench_batching [n_trades]
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+from market_monitor import spread_monitor, trade_handler
+from market_monitor.spread_monitor import price_update_dispatcher
+from market_monitor.trade_handler import trade_logger_and_updater, trade_queue, price_update_queue
+
+EXCHANGES = ["Coinbase", "Kraken", "Bitstamp"]
+PAIRS = {"BTC/USD": 60_000.0, "ETH/USD": 3_000.0}
+
+
+def _synthetic_trades(n: int) -> list[tuple]:
+    rng = random.Random(42)
+    trades = []
+    for i in range(n):
+        pair = rng.choice(list(PAIRS))
+        price = PAIRS[pair] * (1 + rng.uniform(-0.002, 0.002))
+        trades.append((rng.choice(EXCHANGES), pair, rng.choice(["BUY", "SELL"]), price, 0.01, f"t{i}"))
+    return trades
+
+
+PACED_RATES = [(50, 200), (500, 1_000), (5_000, 5_000)]  # (trades/sec, n_trades)
+
+
+def _reset():
+    for ex in list(spread_monitor.prices):
+        spread_monitor.prices[ex].clear()
+    spread_monitor._suppressor._last_value.clear()
+    spread_monitor._suppressor._last_time.clear()
+
+
+async def _run(trades: list[tuple], batched: bool) -> float:
+    _reset()
+
+    tasks = [
+        asyncio.create_task(trade_logger_and_updater(batched=batched)),
+        asyncio.create_task(price_update_dispatcher(batched=batched)),
+    ]
+    start = time.perf_counter()
+    for t in trades:
+        trade_queue.put_nowait(t)
+    await trade_queue.join()
+    await price_update_queue.join()
+    elapsed = time.perf_counter() - start
+
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return elapsed
+
+
+async def _run_paced(trades: list[tuple], batched: bool, rate: float) -> list[float]:
+    """
+    Enqueue trades at `rate`/s and return per-trade latency from enqueue until
+    the spread monitor has applied its price update. The trade's side field
+    carries its index so the update can be matched back to its enqueue time.
+    """
+    _reset()
+    enqueued: dict[str, float] = {}
+    latencies: list[float] = []
+
+    orig_single, orig_batch = spread_monitor.update_price, spread_monitor.update_prices_batch
+
+    async def timed_single(exchange, pair, price, side=None):
+        await orig_single(exchange, pair, price, side=side)
+        latencies.append(time.perf_counter() - enqueued[side])
+
+    async def timed_batch(updates):
+        await orig_batch(updates)
+        now = time.perf_counter()
+        latencies.extend(now - enqueued[side] for _, _, _, side in updates)
+
+    spread_monitor.update_price, spread_monitor.update_prices_batch = timed_single, timed_batch
+    tasks = [
+        asyncio.create_task(trade_logger_and_updater(batched=batched)),
+        asyncio.create_task(price_update_dispatcher(batched=batched)),
+    ]
+    try:
+        interval = 1.0 / rate
+        next_t = time.perf_counter()
+        for i, (ex, pair, _, price, size, ts) in enumerate(trades):
+            next_t += interval
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            enqueued[str(i)] = time.perf_counter()
+            trade_queue.put_nowait((ex, pair, str(i), price, size, ts))
+        await trade_queue.join()
+        await price_update_queue.join()
+    finally:
+        spread_monitor.update_price, spread_monitor.update_prices_batch = orig_single, orig_batch
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return latencies
+
+
+def _fmt_latency(samples: list[float]) -> str:
+    samples = sorted(samples)
+
+    def pct(q: float) -> float:
+        return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+    return f"p50 {pct(0.5):.3f}ms  p99 {pct(0.99):.3f}ms  max {samples[-1] * 1000:.3f}ms"
+
+
+async def main(n: int):
+    logging.basicConfig(level=logging.WARNING)
+    trades = _synthetic_trades(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trade_handler.CSV_FILE = os.path.join(tmp, "trades.csv")
+        trade_handler.JSONL_FILE = os.path.join(tmp, "trades.jsonl")
+
+        per_item = await _run(trades, batched=False)
+        batched = await _run(trades, batched=True)
+
+        paced = []
+        for rate, count in PACED_RATES:
+            sample = trades[:count]
+            paced.append((
+                rate,
+                await _run_paced(sample, batched=False, rate=rate),
+                await _run_paced(sample, batched=True, rate=rate),
+            ))
+
+    print(f"trades:   {n}")
+    print(f"per-item: {per_item:.3f}s  ({n / per_item:,.0f} trades/s)")
+    print(f"batched:  {batched:.3f}s  ({n / batched:,.0f} trades/s)")
+    print(f"speedup:  {per_item / batched:.1f}x")
+    print()
+    print("enqueue -> spread update latency, paced producer")
+    for rate, item_lat, batch_lat in paced:
+        print(f"{rate:>6}/s  per-item: {_fmt_latency(item_lat)}")
+        print(f"{'':>8}  batched:  {_fmt_latency(batch_lat)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
@@ -0,0 +1,99 @@
+# benchmarks/bench_shared_prices.py
+#
+# Snapshot read latency of the shared-memory price table while another
+# process rewrites it at a fixed rate (far above real feed rates by default).
+# Run from the repo root:  python -m benchmarks.bench_shared_prices [n_reads] [writes_per_sec]
+
+import multiprocessing as mp
+import statistics
+import sys
+import time
+
+from market_monitor.shared_prices import SharedPriceReader, SharedPriceTable
+
+NAME = "crypto_spread_prices_bench"
+VENUES = ["Coinbase", "Kraken", "Bitstamp"]
+PAIRS = ["BTC/USD", "ETH/USD"]
+LABELS = ["C-K", "C-B", "K-B"]
+
+
+def _writer(stop, ready, counter, rate):
+    table = SharedPriceTable(NAME)
+    ready.set()
+    i = 0
+    next_t = time.perf_counter()
+    while not stop.is_set():
+        # busy-wait pacing: sleep() granularity is far coarser than the write interval
+        next_t = max(next_t + 1.0 / rate, time.perf_counter())
+        while time.perf_counter() < next_t:
+            pass
+        now = time.time()
+        with table.write():
+            for v in VENUES:
+                for p in PAIRS:
+                    table.set_price(v, p, 1000.0 + i, now)
+            for p in PAIRS:
+                for lbl in LABELS:
+                    table.set_spread(p, lbl, float(i % 7), now)
+        i += 1
+    counter.value = i
+    table.close()
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main(n: int, rate: float):
+    stop, ready, counter = mp.Event(), mp.Event(), mp.Value("q", 0)
+    writer = mp.Process(target=_writer, args=(stop, ready, counter, rate))
+    writer.start()
+    ready.wait()
+
+    raw_ns, snap_ns, failed_ns = [], [], []
+    torn = 0
+    reader = SharedPriceReader(NAME)
+    try:
+        for _ in range(n):
+            t0 = time.perf_counter_ns()
+            reader.read_raw()
+            t1 = time.perf_counter_ns()
+            snap = reader.snapshot()
+            t2 = time.perf_counter_ns()
+            raw_ns.append(t1 - t0)
+            if snap is None:
+                # gave up after max_retries: keep the time it took, it's the worst case
+                failed_ns.append(t2 - t1)
+                continue
+            snap_ns.append(t2 - t1)
+            # a consistent snapshot sees every price from the same write
+            if len({p for by_pair in snap["prices"].values() for p in by_pair.values()}) > 1:
+                torn += 1
+    finally:
+        stop.set()
+        writer.join()
+        retries = reader.retries
+        reader.close()
+
+    print(
+        f"reads: {n}  writes: {counter.value}  seqlock retries: {retries}  "
+        f"failed: {len(failed_ns)}  torn: {torn}"
+    )
+    # failed snapshots are included in the snapshot percentiles, not dropped
+    for label, samples in (("read_raw", raw_ns), ("snapshot", snap_ns + failed_ns)):
+        samples.sort()
+        print(
+            f"{label:<9} p50 {_percentile(samples, 0.5) / 1000:.2f}us  "
+            f"p99 {_percentile(samples, 0.99) / 1000:.2f}us  "
+            f"max {samples[-1] / 1000:.2f}us  "
+            f"mean {statistics.fmean(samples) / 1000:.2f}us"
+        )
+    if failed_ns:
+        print(f"failed    worst {max(failed_ns) / 1000:.2f}us  mean {statistics.fmean(failed_ns) / 1000:.2f}us")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5_000,
+    )
@@ -11,3 +11,25 @@ KRAKEN_PAIR_MAP = {
     "XBT/USD": "BTC/USD",
     "ETH/USD": "ETH/USD"
 }
+
+# Micro-batch mode for the trade and price consumers
+BATCH_MODE = False
+BATCH_MAX_SIZE = 256
+BATCH_MAX_WAIT = 0.005  # seconds to wait for more items, only while under load
+
+# Event-loop instrumentation
+LOOP_LAG_MONITOR = True      # cheap: one timer per interval, plus the SIGUSR1 profiler hook
+# per-task CPU accounting and slow-callback logging wraps every task step
+# (roughly 1.5x slower on a queue-bound micro-benchmark), so it is opt-in
+INSTRUMENTATION = False
+LOOP_LAG_INTERVAL = 0.5      # seconds between loop-lag probes
+LOOP_LAG_WARN = 0.1          # log when the loop wakes up this late
+SLOW_CALLBACK_THRESHOLD = 0.05  # log task steps that block the loop this long
+TASK_STATS_REPORT_EVERY = 60.0  # seconds between per-task CPU summaries
+PROFILE_SECONDS = 10.0       # length of a SIGUSR1-triggered sampling profile
+PROFILE_INTERVAL = 0.005     # seconds between stack samples
+PROFILE_DIR = "."
+
+# Shared-memory latest price/spread table for other local processes
+# (see market_monitor/shared_prices.py); set to None to disable
+SHARED_PRICE_TABLE = "crypto_spread_prices"
@@ -1,8 +1,13 @@
+import argparse
 import asyncio
+import sys
+import time as _time
 import websockets
 import json
 import aiohttp
 from datetime import datetime, timezone
+from itertools import combinations
+from typing import Optional
 import logging
 
 # ───────────── Logging Setup ─────────────
@@ -13,19 +18,128 @@ logger = logging.getLogger(__name__)
 COINBASE_WS = "wss://advanced-trade-ws.coinbase.com"
 KRAKEN_WS = "wss://ws.kraken.com"
 UNISWAP_DEXSCREENER = "https://api.dexscreener.com/latest/dex/pairs/ethereum/0x8ad599c3a0ff1de082011efddc58f1908eb6e6d8"
+UNISWAP_POLL_SECONDS = 30
+
+# seconds without a message before a feed is shown as stale; None = never
+# (streaming feeds use the default, polled/one-shot sources get their own)
+DEFAULT_STALE_AFTER = 10.0
+STALE_AFTER = {
+    "Uniswap": 2 * UNISWAP_POLL_SECONDS,
+    "Coinbase REST": None,  # one-shot fallback, only refreshed on a Coinbase WS error
+}
+
+# ───────────── Dashboard ─────────────
+class Dashboard:
+    """
+    Latest state per venue/pair, redrawn as a fixed table at a capped frame rate.
+
+    Feeds only call ingest()/status(), which are O(1) dict updates; all formatting
+    and terminal output happens in run(), at most `fps` times per second, so the
+    display cost does not depend on the message rate.
+    """
+
+    def __init__(self, fps: float = 4.0):
+        self.frame_interval = 1.0 / max(fps, 0.1)
+        self.last_price: dict[tuple[str, str], float] = {}
+        self.last_side: dict[tuple[str, str], str] = {}
+        self.counts: dict[tuple[str, str], int] = {}
+        self.rates: dict[tuple[str, str], float] = {}
+        self.last_seen: dict[str, float] = {}
+        self.feed_status: dict[str, str] = {}
+        self._prev_counts: dict[tuple[str, str], int] = {}
+        self._prev_frame = _time.monotonic()
+
+    def ingest(self, venue: str, pair: str, side: str, price: float):
+        key = (venue, pair.replace("-", "/"))
+        self.last_price[key] = price
+        self.last_side[key] = side
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.last_seen[venue] = _time.monotonic()
+        self.feed_status[venue] = "OK"
+
+    def status(self, venue: str, text: str):
+        self.feed_status[venue] = text
+        self.last_seen.setdefault(venue, _time.monotonic())
+
+    def _update_rates(self, now: float):
+        dt = now - self._prev_frame
+        if dt <= 0:
+            return
+        for key, count in self.counts.items():
+            inst = (count - self._prev_counts.get(key, 0)) / dt
+            # light smoothing so the column doesn't flicker between frames
+            self.rates[key] = 0.5 * self.rates.get(key, inst) + 0.5 * inst
+        self._prev_counts = dict(self.counts)
+        self._prev_frame = now
+
+    def render(self) -> str:
+        now = _time.monotonic()
+        self._update_rates(now)
+        stamp = datetime.now(tz=timezone.utc).strftime("%H:%M:%S")
+        lines = [f"🚀 Live Crypto Price Monitor — {stamp} UTC", ""]
+
+        lines.append(f"{'Venue':<14}{'Pair':<12}{'Side':<6}{'Last Price':>16}{'Trades/s':>10}")
+        lines.append("─" * 58)
+        for venue, pair in sorted(self.last_price):
+            key = (venue, pair)
+            lines.append(
+                f"{venue:<14}{pair:<12}{self.last_side.get(key, ''):<6}"
+                f"{'$' + format(self.last_price[key], ',.2f'):>16}{self.rates.get(key, 0.0):>10.1f}"
+            )
+
+        lines += ["", f"{'Spread':<26}{'Pair':<12}{'Value':>12}", "─" * 50]
+        by_pair: dict[str, list[str]] = {}
+        for venue, pair in self.last_price:
+            by_pair.setdefault(pair, []).append(venue)
+        for pair in sorted(by_pair):
+            for a, b in combinations(sorted(by_pair[pair]), 2):
+                val = self.last_price[(a, pair)] - self.last_price[(b, pair)]
+                lines.append(f"{a + ' - ' + b:<26}{pair:<12}{val:>+12.2f}")
+
+        lines += ["", f"{'Feed':<14}{'Health':<10}{'Last msg':>10}  Status", "─" * 50]
+        for venue in sorted(self.last_seen):
+            age = now - self.last_seen[venue]
+            text = self.feed_status.get(venue, "")
+            if text.startswith("❌"):
+                health = "DOWN"
+            elif text == "OK":
+                limit = STALE_AFTER.get(venue, DEFAULT_STALE_AFTER)
+                health = "OK" if limit is None or age < limit else "STALE"
+            else:
+                health = "WAIT"
+            lines.append(f"{venue:<14}{health:<10}{age:>9.1f}s  {text}")
+        return "\n".join(lines)
+
+    async def run(self):
+        while True:
+            frame = self.render()
+            # clear screen + home cursor, then draw the whole frame in one write
+            sys.stdout.write("\x1b[H\x1b[2J" + frame + "\n")
+            sys.stdout.flush()
+            await asyncio.sleep(self.frame_interval)
+
+
+dashboard: Optional[Dashboard] = None
+
+
+def _status(venue: str, text: str):
+    if dashboard is not None:
+        dashboard.status(venue, text)
+    else:
+        print(text)
 
 # ───────────── Coinbase WebSocket ─────────────
 async def listen_coinbase():
     try:
         async with websockets.connect(COINBASE_WS, ping_interval=30, ping_timeout=10) as ws:
-            print("🔗 Connected to Coinbase WebSocket")
+            _status("Coinbase", "🔗 Connected to Coinbase WebSocket")
             subscribe_msg = {
                 "type": "subscribe",
                 "channel": "market_trades",
                 "product_ids": ["BTC-USD", "ETH-USD"]
             }
             await ws.send(json.dumps(subscribe_msg))
-            print("📡 Subscribed to Coinbase market trades...")
+            _status("Coinbase", "📡 Subscribed to Coinbase market trades...")
 
             while True:
                 msg = await ws.recv()
@@ -34,12 +148,15 @@ async def listen_coinbase():
                 for ev in events:
                     trades = ev.get("trades", [])
                     for t in trades:
+                        if dashboard is not None:
+                            dashboard.ingest("Coinbase", t['product_id'], t['side'], float(t['price']))
+                            continue
                         print(
                             f"[Coinbase] {t['product_id']} | {t['side']:4s} | "
                             f"Price: ${float(t['price']):,.2f} | Size: {t['size']} | Time: {t['time']}"
                         )
     except Exception as e:
-        print(f"❌ Coinbase WS error: {e}")
+        _status("Coinbase", f"❌ Coinbase WS error: {e}")
         await fetch_coinbase_rest_api()
 
 # ───────────── Kraken WebSocket ─────────────
@@ -57,7 +174,7 @@ async def listen_kraken():
                 "subscription": {"name": "trade"}
             }
             await ws.send(json.dumps(subscribe_msg))
-            print("🔗 Subscribed to Kraken WebSocket trades...")
+            _status("Kraken", "🔗 Subscribed to Kraken WebSocket trades...")
 
             while True:
                 msg = await ws.recv()
@@ -68,19 +185,22 @@ async def listen_kraken():
                     trades = data[1]
                     for t in trades:
                         price = float(t[0])
-                        size = t[1]
                         side = "BUY" if t[3] == "b" else "SELL"
+                        if dashboard is not None:
+                            dashboard.ingest("Kraken", KRAKEN_PAIR_MAP.get(pair_code, pair_code), side, price)
+                            continue
+                        size = t[1]
                         timestamp = float(t[2])
                         time = datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
                         pair_name = KRAKEN_PAIR_MAP.get(pair_code, pair_code)
                         print(f"[Kraken] {pair_name} | {side:4s} | Price: ${price:,.2f} | Size: {size} | Time: {time}")
     except Exception as e:
-        print(f"❌ Kraken WS error: {e}")
+        _status("Kraken", f"❌ Kraken WS error: {e}")
 
 
 # ───────────── Uniswap Polling ─────────────
 async def poll_uniswap_price():
-    print("🔄 Polling Uniswap (Dexscreener) every 30 seconds...")
+    _status("Uniswap", f"🔄 Polling Uniswap (Dexscreener) every {UNISWAP_POLL_SECONDS} seconds...")
     async with aiohttp.ClientSession() as session:
         while True:
             try:
@@ -91,17 +211,20 @@ async def poll_uniswap_price():
                         base = pair["baseToken"]["symbol"]
                         quote = pair["quoteToken"]["symbol"]
                         price = float(pair["priceUsd"])
-                        now = datetime.utcnow().isoformat()
-                        print(f"[Uniswap] {base}/{quote} | Price: ${price:,.2f} | Time: {now}")
+                        if dashboard is not None:
+                            dashboard.ingest("Uniswap", f"{base}/{quote}", "REF", price)
+                        else:
+                            now = datetime.utcnow().isoformat()
+                            print(f"[Uniswap] {base}/{quote} | Price: ${price:,.2f} | Time: {now}")
                     else:
-                        print(f"❌ Uniswap HTTP error {resp.status}")
+                        _status("Uniswap", f"❌ Uniswap HTTP error {resp.status}")
             except Exception as e:
-                print(f"❌ Uniswap polling error: {e}")
-            await asyncio.sleep(30)
+                _status("Uniswap", f"❌ Uniswap polling error: {e}")
+            await asyncio.sleep(UNISWAP_POLL_SECONDS)
 
 # ───────────── Coinbase REST Fallback ─────────────
 async def fetch_coinbase_rest_api():
-    print("🔄 Fetching Coinbase prices via REST fallback...")
+    _status("Coinbase REST", "🔄 Fetching Coinbase prices via REST fallback...")
     try:
         async with aiohttp.ClientSession() as session:
             for symbol in ["BTC", "ETH"]:
@@ -110,19 +233,28 @@ async def fetch_coinbase_rest_api():
                     if resp.status == 200:
                         data = await resp.json()
                         price = float(data['data']['rates']['USD'])
+                        if dashboard is not None:
+                            dashboard.ingest("Coinbase REST", f"{symbol}/USD", "REST", price)
+                            continue
                         now = datetime.utcnow().isoformat()
                         print(f"[Coinbase REST] {symbol}/USD | Price: ${price:,.2f} | Time: {now}")
     except Exception as e:
-        print(f"❌ Coinbase REST fetch failed: {e}")
+        _status("Coinbase REST", f"❌ Coinbase REST fetch failed: {e}")
 
 # ───────────── Main ─────────────
-async def main():
+async def main(dashboard_mode: bool = False, fps: float = 4.0):
+    global dashboard
     print("🚀 Starting Live Crypto Price Monitor...")
+    # set up before any feed task exists, so no feed can see dashboard unset
+    if dashboard_mode:
+        dashboard = Dashboard(fps=fps)
     tasks = [
         asyncio.create_task(listen_coinbase()),
         asyncio.create_task(listen_kraken()),
         asyncio.create_task(poll_uniswap_price())
     ]
+    if dashboard is not None:
+        tasks.append(asyncio.create_task(dashboard.run()))
     try:
         await asyncio.gather(*tasks)
     except KeyboardInterrupt:
@@ -133,4 +265,8 @@ async def main():
 
 # ───────────── Entry ─────────────
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Live crypto trade viewer")
+    parser.add_argument("--dashboard", action="store_true", help="redraw a fixed table instead of printing every trade")
+    parser.add_argument("--fps", type=float, default=4.0, help="dashboard frame-rate cap (default: 4)")
+    args = parser.parse_args()
+    asyncio.run(main(dashboard_mode=args.dashboard, fps=args.fps))
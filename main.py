@@ -1,13 +1,16 @@
 import asyncio
 import logging
 
+import config
+
 from feeds.coinbase import listen_coinbase
 from feeds.kraken import listen_kraken
 from feeds.bitstamp import listen_bitstamp
 # from feeds.uniswap import poll_uniswap_price  # optional, if you still want the ref feed
 
 from market_monitor.trade_handler import trade_logger_and_updater
-from market_monitor.spread_monitor import price_update_dispatcher
+from market_monitor.spread_monitor import price_update_dispatcher, enable_shared_table, disable_shared_table
+from market_monitor.instrumentation import instrumented_task, install_profiler_signal, monitor_loop_lag
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,14 +22,34 @@ logger = logging.getLogger(__name__)
 async def main():
     logger.info("🚀 Starting Live Crypto Price Monitor...")
 
+    if config.SHARED_PRICE_TABLE:
+        try:
+            enable_shared_table(config.SHARED_PRICE_TABLE)
+            logger.info("📤 Publishing latest prices to shared memory %r", config.SHARED_PRICE_TABLE)
+        except FileExistsError as e:
+            logger.warning("Shared price table disabled: %s", e)
+
+    if config.INSTRUMENTATION:
+        def spawn(coro, name):
+            return instrumented_task(coro, name, slow_threshold=config.SLOW_CALLBACK_THRESHOLD)
+    else:
+        def spawn(coro, name):
+            return asyncio.create_task(coro, name=name)
+
     tasks = [
-        asyncio.create_task(trade_logger_and_updater()),
-        asyncio.create_task(price_update_dispatcher()),
-        asyncio.create_task(listen_coinbase()),
-        asyncio.create_task(listen_kraken()),
-        asyncio.create_task(listen_bitstamp()),
-        # asyncio.create_task(poll_uniswap_price()),  # optional
+        spawn(trade_logger_and_updater(config.BATCH_MODE, config.BATCH_MAX_SIZE, config.BATCH_MAX_WAIT), "trade_logger_and_updater"),
+        spawn(price_update_dispatcher(config.BATCH_MODE, config.BATCH_MAX_SIZE, config.BATCH_MAX_WAIT), "price_update_dispatcher"),
+        spawn(listen_coinbase(), "listen_coinbase"),
+        spawn(listen_kraken(), "listen_kraken"),
+        spawn(listen_bitstamp(), "listen_bitstamp"),
+        # spawn(poll_uniswap_price(), "poll_uniswap_price"),  # optional
     ]
+
+    if config.LOOP_LAG_MONITOR:
+        tasks.append(asyncio.create_task(monitor_loop_lag(
+            config.LOOP_LAG_INTERVAL, config.LOOP_LAG_WARN, config.TASK_STATS_REPORT_EVERY
+        ), name="monitor_loop_lag"))
+        install_profiler_signal(config.PROFILE_SECONDS, config.PROFILE_INTERVAL, config.PROFILE_DIR)
     try:
         await asyncio.gather(*tasks)
     except asyncio.CancelledError:
@@ -36,6 +59,8 @@ async def main():
         for t in tasks:
             t.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        disable_shared_table()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+
+class AdaptiveBatcher:
+    """
+    Drain an asyncio.Queue in micro-batches.
+
+    The first item is awaited as usual; everything already waiting in the queue
+    is then taken without blocking, up to the current batch size. The batch size
+    grows while batches keep filling up and shrinks again once traffic is quiet.
+    Only while under load (the previous batch was full) does the batcher wait up
+    to `max_wait` seconds for more items, so a quiet feed never pays extra latency.
+
+    With timestamped=True each item is returned as (received_at, item), where
+    received_at is the UTC datetime at which that item was taken off the queue.
+    """
+
+    def __init__(
+        self,
+        queue: asyncio.Queue,
+        min_size: int = 8,
+        max_size: int = 256,
+        max_wait: float = 0.005,
+        timestamped: bool = False,
+    ):
+        self.queue = queue
+        self.timestamped = timestamped
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.max_wait = max_wait
+        self.size = self.min_size
+        self._saturated = False
+
+    async def next_batch(self) -> list:
+        batch = [self._take(await self.queue.get())]
+        limit = self.size
+
+        while len(batch) < limit:
+            try:
+                batch.append(self._take(self.queue.get_nowait()))
+            except asyncio.QueueEmpty:
+                break
+
+        if self._saturated and self.max_wait > 0 and len(batch) < limit:
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < limit:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._take(await asyncio.wait_for(self.queue.get(), remaining)))
+                except asyncio.TimeoutError:
+                    break
+
+        self._adapt(len(batch), limit)
+        return batch
+
+    def _take(self, item):
+        if self.timestamped:
+            return datetime.now(tz=timezone.utc), item
+        return item
+
+    def done(self, batch: list):
+        """Mark every item of a batch as processed on the underlying queue."""
+        for _ in batch:
+            self.queue.task_done()
+
+    def _adapt(self, got: int, limit: int):
+        self._saturated = got >= limit and got > 1
+        if self._saturated:
+            self.size = min(self.size * 2, self.max_size)
+        elif got <= limit // 4:
+            self.size = max(self.size // 2, self.min_size)
@@ -0,0 +1,242 @@
+import asyncio
+import collections
+import collections.abc
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TaskStats:
+    def __init__(self):
+        self.cpu_time = 0.0
+        self.wall_time = 0.0
+        self.steps = 0
+        self.slow_steps = 0
+        self.max_step = 0.0
+
+
+# per-task CPU/wall accounting, keyed by task name
+task_stats: dict[str, TaskStats] = {}
+
+# latest loop lag measurements (seconds)
+loop_lag = {"last": 0.0, "max": 0.0}
+
+
+def _suspended_at(coro) -> list[tuple]:
+    """
+    Cheap capture of where `coro` is suspended: (code, lineno) for each link
+    of its await chain. Only turned into text by _describe() for slow steps.
+    """
+    links = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        links.append((frame.f_code, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return links
+
+
+def _describe(links: list[tuple]) -> str:
+    parts = []
+    for code, lineno in links:
+        name = getattr(code, "co_qualname", code.co_name)
+        parts.append(f"{name} ({os.path.basename(code.co_filename)}:{lineno})")
+    return " → ".join(parts) or "?"
+
+
+class _TimedCoroutine(collections.abc.Coroutine):
+    """
+    Coroutine wrapper that drives `coro` step by step, charging the CPU and
+    wall time of every step (the code that runs between two awaits) to
+    `stats`. Steps that hold the event loop longer than `slow_threshold` are
+    logged with the await chain the step resumed from; the blocking code ran
+    somewhere after that point.
+
+    A real Coroutine (not a generator), so asyncio.create_task() accepts it
+    on every supported Python.
+    """
+
+    def __init__(self, coro: Coroutine, stats: TaskStats, name: str, slow_threshold: float):
+        self._coro = coro
+        self._stats = stats
+        self._name = name
+        self._slow_threshold = slow_threshold
+        self.__qualname__ = getattr(coro, "__qualname__", name)
+        self.__name__ = getattr(coro, "__name__", name)
+
+    # expose the wrapped coroutine's state, for task repr/get_stack and _suspended_at
+    @property
+    def cr_frame(self):
+        return self._coro.cr_frame
+
+    @property
+    def cr_await(self):
+        return self._coro.cr_await
+
+    @property
+    def cr_code(self):
+        return self._coro.cr_code
+
+    @property
+    def cr_running(self):
+        return self._coro.cr_running
+
+    def _step(self, fn, *args):
+        where = _suspended_at(self._coro)
+        t0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            return fn(*args)
+        finally:
+            _charge(self._stats, self._name, where, t0, c0, self._slow_threshold)
+
+    def send(self, value):
+        # inlined _step: this is the per-step hot path
+        coro = self._coro
+        where = _suspended_at(coro)
+        t0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            return coro.send(value)
+        finally:
+            _charge(self._stats, self._name, where, t0, c0, self._slow_threshold)
+
+    def throw(self, typ, val=None, tb=None):
+        if val is None and tb is None:
+            return self._step(self._coro.throw, typ)
+        return self._step(self._coro.throw, typ, val, tb)
+
+    def close(self):
+        self._coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+
+def _charge(stats: TaskStats, name: str, where: list[tuple], t0: float, c0: float, slow_threshold: float):
+    wall = time.perf_counter() - t0
+    stats.cpu_time += time.thread_time() - c0
+    stats.wall_time += wall
+    stats.steps += 1
+    stats.max_step = max(stats.max_step, wall)
+    if wall >= slow_threshold:
+        stats.slow_steps += 1
+        logger.warning(
+            "🐢 Slow callback in task %s: %.3fs blocking the loop in the step resumed at %s",
+            name, wall, _describe(where),
+        )
+
+
+def instrumented_task(coro: Coroutine, name: str, slow_threshold: float = 0.05) -> asyncio.Task:
+    """create_task() with per-step CPU accounting and slow-callback logging."""
+    stats = task_stats.setdefault(name, TaskStats())
+    return asyncio.create_task(_TimedCoroutine(coro, stats, name, slow_threshold), name=name)
+
+
+async def monitor_loop_lag(interval: float = 0.5, warn_threshold: float = 0.1, report_every: float = 60.0):
+    """
+    Measure how late the event loop wakes up from a fixed sleep; any delay
+    beyond `interval` is time the loop spent running something else.
+    Periodically logs a per-task CPU summary.
+    """
+    loop = asyncio.get_running_loop()
+    last_report = loop.time()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        now = loop.time()
+        lag = max(0.0, now - start - interval)
+        loop_lag["last"] = lag
+        loop_lag["max"] = max(loop_lag["max"], lag)
+        if lag >= warn_threshold:
+            logger.warning("⏱️ Event loop lag %.3fs", lag)
+
+        if report_every and now - last_report >= report_every:
+            last_report = now
+            logger.info("📊 Loop lag max %.3fs | Task CPU: %s", loop_lag["max"], format_task_stats())
+            loop_lag["max"] = 0.0
+
+
+def format_task_stats() -> str:
+    parts = []
+    for name, s in sorted(task_stats.items(), key=lambda kv: -kv[1].cpu_time):
+        parts.append(f"{name} {s.cpu_time:.2f}s/{s.steps} steps (max {s.max_step * 1000:.0f}ms)")
+    return " | ".join(parts) or "-"
+
+
+class SamplingProfiler:
+    """
+    Sample the event-loop thread's stack from a background thread and write
+    the result in collapsed-stack format ("frame;frame;frame count"), which
+    flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, thread_id: int, duration: float = 10.0, interval: float = 0.005, out_dir: str = "."):
+        self.thread_id = thread_id
+        self.duration = duration
+        self.interval = interval
+        self.out_dir = out_dir
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            logger.info("Profiler already running, ignoring trigger")
+            return
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info("🔬 Sampling profiler started for %gs", self.duration)
+
+    def _run(self):
+        counts: collections.Counter = collections.Counter()
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                counts[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+        stamp = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = os.path.join(self.out_dir, f"profile-{stamp}.folded")
+        with open(path, "w") as f:
+            for stack, n in counts.most_common():
+                f.write(f"{stack} {n}\n")
+        logger.info("🔬 Wrote %d samples to %s", sum(counts.values()), path)
+
+
+def install_profiler_signal(duration: float = 10.0, interval: float = 0.005, out_dir: str = ".") -> Optional[SamplingProfiler]:
+    """
+    Start a SamplingProfiler on the running loop's thread whenever the
+    process receives SIGUSR1 (`kill -USR1 <pid>`). Returns None where the
+    platform has no SIGUSR1 or the loop doesn't support signal handlers.
+    """
+    sig = getattr(signal, "SIGUSR1", None)
+    if sig is None:
+        return None
+    profiler = SamplingProfiler(threading.get_ident(), duration, interval, out_dir)
+    try:
+        asyncio.get_running_loop().add_signal_handler(sig, profiler.start)
+    except (NotImplementedError, RuntimeError):
+        return None
+    logger.info("🔬 Send SIGUSR1 to pid %d to record a %gs profile", os.getpid(), duration)
+    return profiler
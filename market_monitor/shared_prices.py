@@ -0,0 +1,312 @@
+"""
+Latest price/spread table in a fixed-layout shared-memory segment.
+
+The monitor owns a SharedPriceTable and writes into it; any local process can
+attach a SharedPriceReader by name and take consistent snapshots without
+talking to the monitor. Only the standard library is used, so strategy
+processes can import this module on its own.
+
+Layout (little-endian, offsets in bytes):
+
+    0   header   magic "SPRDTBL1", layout version, slot capacity,
+                 seq (u64 at offset 16), updated_at, n_prices, n_spreads,
+                 writer pid, closed flag, generation
+    64  prices   MAX_PRICES  x (venue 16s, pair 16s, price f64, ts f64)
+    ..  spreads  MAX_SPREADS x (pair 16s, label 8s, value f64, ts f64)
+
+Consistency uses a seqlock: the writer bumps `seq` to an odd value, updates
+slots, then bumps it back to even. A reader copies the table, re-reads `seq`,
+and retries if it was odd or changed in between. Reads are plain memory loads
+on the mapped segment, with no syscalls, locks or serialization.
+
+Each price slot carries the time that venue's price last changed, so readers
+can tell a stale venue from a fresh one. The header records the writer's pid
+and a closed flag; a new writer only reclaims a segment whose owner has closed
+it or is no longer running, and bumps `generation` when it does.
+
+Segments are kept out of multiprocessing's resource tracker, which would
+otherwise unlink them as soon as the creating process dies. A segment left by
+a crashed monitor therefore stays in /dev/shm until the next monitor reclaims
+it in place, and readers that are still attached follow the new writer. Only
+a clean close() removes it.
+
+Names longer than the slot fields (16 bytes for venue/pair, 8 for spread
+labels) and updates past MAX_PRICES/MAX_SPREADS are rejected with a warning
+logged once per key, never truncated or merged.
+"""
+import logging
+import os
+import struct
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAME = "crypto_spread_prices"
+
+MAGIC = b"SPRDTBL1"
+LAYOUT_VERSION = 1
+MAX_PRICES = 64
+MAX_SPREADS = 64
+
+_HEADER = struct.Struct("<8sIIQdII")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 16
+_COUNTS = struct.Struct("<dII")
+_COUNTS_OFFSET = 24
+_OWNER = struct.Struct("<IIQ")
+_OWNER_OFFSET = 40
+_CLOSED_OFFSET = 44
+_FLAG = struct.Struct("<I")
+_HEADER_SIZE = 64
+_NAME_LEN = 16
+_LABEL_LEN = 8
+_PRICE_SLOT = struct.Struct(f"<{_NAME_LEN}s{_NAME_LEN}sdd")
+_SPREAD_SLOT = struct.Struct(f"<{_NAME_LEN}s{_LABEL_LEN}sdd")
+_PRICES_OFFSET = _HEADER_SIZE
+_SPREADS_OFFSET = _PRICES_OFFSET + MAX_PRICES * _PRICE_SLOT.size
+SEGMENT_SIZE = _SPREADS_OFFSET + MAX_SPREADS * _SPREAD_SLOT.size
+
+
+def _name(b: bytes) -> str:
+    return b.rstrip(b"\0").decode()
+
+
+def _owner(buf) -> Optional[tuple[int, int, int]]:
+    """(writer pid, closed flag, generation), or None if `buf` isn't a table of this layout."""
+    magic, version, *_ = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != LAYOUT_VERSION:
+        return None
+    return _OWNER.unpack_from(buf, _OWNER_OFFSET)
+
+
+def _open_untracked(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """Open a segment without registering it with the resource tracker."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        # Python < 3.13 always registers; undo it so neither a reader exiting
+        # nor the writer crashing makes the tracker unlink the segment
+        shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _unlink_untracked(shm: shared_memory.SharedMemory):
+    """unlink() a segment opened by _open_untracked, tolerating one already gone."""
+    if not getattr(shm, "_track", True):
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        return
+    # Python < 3.13: unlink() also unregisters, so register first to keep the tracker balanced
+    resource_tracker.register(shm._name, "shared_memory")
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedPriceTable:
+    """Writer side. Only one process (the monitor) should write a given segment."""
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        generation = seq = 0
+        try:
+            self.shm = _open_untracked(name, create=True, size=SEGMENT_SIZE)
+        except FileExistsError:
+            self.shm = _open_untracked(name)
+            owner = _owner(self.shm.buf) if self.shm.size >= SEGMENT_SIZE else None
+            if owner is not None and not owner[1] and _pid_alive(owner[0]):
+                self.shm.close()
+                raise FileExistsError(f"Shared price table {name!r} is in use by pid {owner[0]}")
+            if owner is None:
+                # not one of ours, or an older layout: replace it
+                self.shm.close()
+                _unlink_untracked(self.shm)
+                self.shm = _open_untracked(name, create=True, size=SEGMENT_SIZE)
+            else:
+                # left over from a monitor that didn't shut down cleanly; reuse it
+                # in place so readers that are still attached pick up the new writer
+                generation = owner[2] + 1
+                # keep seq moving forward so a reader mid-copy can't mistake the reset for no change
+                seq = (_SEQ.unpack_from(self.shm.buf, _SEQ_OFFSET)[0] | 1) + 1
+
+        self.buf = self.shm.buf
+        self._seq = seq
+        self._price_slots: dict[tuple[str, str], int] = {}
+        self._spread_slots: dict[tuple[str, str], int] = {}
+        self._rejected: set[tuple[str, str]] = set()
+        # odd seq while resetting, so attached readers never see a half-cleared table
+        _SEQ.pack_into(self.buf, _SEQ_OFFSET, seq + 1)
+        _HEADER.pack_into(self.buf, 0, MAGIC, LAYOUT_VERSION, MAX_PRICES, seq + 1, 0.0, 0, 0)
+        _OWNER.pack_into(self.buf, _OWNER_OFFSET, os.getpid(), 0, generation)
+        _SEQ.pack_into(self.buf, _SEQ_OFFSET, self._seq)
+
+    @contextmanager
+    def write(self):
+        """Group several set_* calls into one atomic update for readers."""
+        self._seq += 1
+        _SEQ.pack_into(self.buf, _SEQ_OFFSET, self._seq)
+        try:
+            yield self
+        finally:
+            _COUNTS.pack_into(
+                self.buf, _COUNTS_OFFSET, time.time(), len(self._price_slots), len(self._spread_slots)
+            )
+            # seq goes last, on its own, so readers never see an even seq with a half-written table
+            self._seq += 1
+            _SEQ.pack_into(self.buf, _SEQ_OFFSET, self._seq)
+
+    def set_price(self, venue: str, pair: str, price: float, ts: float) -> bool:
+        """Write one venue's price. Returns False (warning logged once) if it can't be stored."""
+        idx = self._price_slots.get((venue, pair))
+        if idx is None:
+            idx = self._new_slot(
+                self._price_slots, MAX_PRICES, "prices", (venue, pair), (venue, _NAME_LEN), (pair, _NAME_LEN)
+            )
+            if idx is None:
+                return False
+        _PRICE_SLOT.pack_into(
+            self.buf, _PRICES_OFFSET + idx * _PRICE_SLOT.size, venue.encode(), pair.encode(), price, ts
+        )
+        return True
+
+    def set_spread(self, pair: str, label: str, value: float, ts: float) -> bool:
+        """Write one spread. Returns False (warning logged once) if it can't be stored."""
+        idx = self._spread_slots.get((pair, label))
+        if idx is None:
+            idx = self._new_slot(
+                self._spread_slots, MAX_SPREADS, "spreads", (pair, label), (pair, _NAME_LEN), (label, _LABEL_LEN)
+            )
+            if idx is None:
+                return False
+        _SPREAD_SLOT.pack_into(
+            self.buf, _SPREADS_OFFSET + idx * _SPREAD_SLOT.size, pair.encode(), label.encode(), value, ts
+        )
+        return True
+
+    def _new_slot(
+        self, slots: dict, capacity: int, section: str, key: tuple[str, str], *fields: tuple[str, int]
+    ) -> Optional[int]:
+        for text, limit in fields:
+            if len(text.encode()) > limit:
+                self._warn_once(key, f"not publishing {key[0]}/{key[1]}: {text!r} is longer than {limit} bytes")
+                return None
+        if len(slots) >= capacity:
+            # one warning per full section, not one per key that doesn't fit
+            self._warn_once(
+                (section, ""),
+                f"{section} section is full ({capacity} slots); dropping new keys from {key[0]}/{key[1]} on",
+            )
+            return None
+        slots[key] = len(slots)
+        return slots[key]
+
+    def _warn_once(self, key: tuple[str, str], message: str):
+        if key not in self._rejected:
+            self._rejected.add(key)
+            logger.warning("Shared price table: %s", message)
+
+    def close(self, unlink: bool = True):
+        """Mark the table closed for readers, then release (and by default remove) it."""
+        _FLAG.pack_into(self.buf, _CLOSED_OFFSET, 1)
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            _unlink_untracked(self.shm)
+
+
+class SharedPriceReader:
+    """
+    Reader side, for use from any local process:
+
+        reader = SharedPriceReader()
+        snap = reader.snapshot()
+        snap["prices"]["Kraken"]["BTC/USD"], snap["spreads"]["BTC/USD"]["C-K"]
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        self.shm = _open_untracked(name)
+
+        self.buf = self.shm.buf
+        magic, version, *_ = _HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.close()
+            raise ValueError(f"Shared segment {name!r} is not a v{LAYOUT_VERSION} price table")
+        self.retries = 0
+
+    def writer_alive(self) -> bool:
+        """
+        False once the writer has closed the table or its process is gone.
+        Unlike snapshot(), this makes a syscall (kill(pid, 0)), so poll it sparingly.
+        """
+        pid, closed, _ = _OWNER.unpack_from(self.buf, _OWNER_OFFSET)
+        return not closed and _pid_alive(pid)
+
+    def read_raw(self, max_retries: int = 10_000) -> Optional[tuple[tuple, bytes]]:
+        """
+        Copy a consistent (header, body) pair. Returns None if every one of
+        `max_retries` attempts overlapped a write; callers must handle that,
+        e.g. by retrying later or keeping their previous snapshot.
+        """
+        buf = self.buf
+        for _ in range(max_retries):
+            seq1 = _SEQ.unpack_from(buf, _SEQ_OFFSET)[0]
+            if seq1 & 1:
+                self.retries += 1
+                continue
+            header = _HEADER.unpack_from(buf, 0) + _OWNER.unpack_from(buf, _OWNER_OFFSET)
+            body = bytes(buf[_HEADER_SIZE:SEGMENT_SIZE])
+            if _SEQ.unpack_from(buf, _SEQ_OFFSET)[0] == seq1:
+                return header, body
+            self.retries += 1
+        return None
+
+    def snapshot(self) -> Optional[dict]:
+        """
+        Decode a consistent copy of the table into
+        {"seq", "updated_at", "generation", "prices", "spreads", "price_ts"},
+        where price_ts[venue][pair] is when that venue's price last changed.
+        Returns None under sustained write contention (see read_raw).
+        """
+        raw = self.read_raw()
+        if raw is None:
+            return None
+        (_, _, _, seq, updated_at, n_prices, n_spreads, _, _, generation), body = raw
+
+        prices: dict[str, dict[str, float]] = {}
+        price_ts: dict[str, dict[str, float]] = {}
+        for i in range(n_prices):
+            venue, pair, price, ts = _PRICE_SLOT.unpack_from(body, i * _PRICE_SLOT.size)
+            venue, pair = _name(venue), _name(pair)
+            prices.setdefault(venue, {})[pair] = price
+            price_ts.setdefault(venue, {})[pair] = ts
+
+        spreads: dict[str, dict[str, float]] = {}
+        base = _SPREADS_OFFSET - _HEADER_SIZE
+        for i in range(n_spreads):
+            pair, label, value, _ = _SPREAD_SLOT.unpack_from(body, base + i * _SPREAD_SLOT.size)
+            spreads.setdefault(_name(pair), {})[_name(label)] = value
+
+        return {
+            "seq": seq, "updated_at": updated_at, "generation": generation,
+            "prices": prices, "spreads": spreads, "price_ts": price_ts,
+        }
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
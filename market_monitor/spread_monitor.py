@@ -3,6 +3,8 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional
 
+from market_monitor.batching import AdaptiveBatcher
+from market_monitor.shared_prices import SharedPriceTable
 from market_monitor.trade_handler import price_update_queue
 
 logger = logging.getLogger(__name__)
@@ -37,6 +39,31 @@ class UpdateSuppressor:
             return True
         return False
 
+    def should_emit_many(self, keys: list[str], values: list[float], now_ts: float) -> list[bool]:
+        """
+        Same rules as should_emit for parallel lists of keys and values sharing
+        one timestamp, in a single pass with the state dicts and thresholds
+        bound once for the whole batch.
+        """
+        last_value, last_time = self._last_value, self._last_time
+        min_interval, abs_threshold, rel_threshold = self.min_interval, self.abs_threshold, self.rel_threshold
+        emit: list[bool] = []
+
+        for key, new_value in zip(keys, values):
+            last_val = last_value.get(key)
+            if last_val is None:
+                ok = True
+            elif now_ts - last_time.get(key, 0) < min_interval:
+                ok = False
+            else:
+                abs_diff = abs(new_value - last_val)
+                ok = abs_diff >= abs_threshold or (abs_diff / last_val >= rel_threshold if last_val != 0 else True)
+            if ok:
+                last_value[key] = new_value
+                last_time[key] = now_ts
+            emit.append(ok)
+        return emit
+
 
 _suppressor = UpdateSuppressor(min_interval=1.0, abs_threshold=0.25, rel_threshold=0.002)
 _lock = asyncio.Lock()
@@ -49,6 +76,42 @@ prices: dict[str, dict[str, float]] = {
     "Coinbase REST": {},  # optional fallback
 }
 
+# optional shared-memory mirror of prices/spreads for other local processes
+_shared_table: Optional[SharedPriceTable] = None
+
+
+def enable_shared_table(name: str) -> SharedPriceTable:
+    global _shared_table
+    _shared_table = SharedPriceTable(name)
+    return _shared_table
+
+
+def disable_shared_table():
+    global _shared_table
+    if _shared_table is not None:
+        _shared_table.close()
+        _shared_table = None
+
+
+def _publish(
+    changed: dict[tuple[str, str], float],
+    spreads_by_pair: dict[str, list[tuple[str, float]]],
+    now_ts: float,
+):
+    """
+    Mirror updated prices and the recomputed spreads into the shared table, if
+    enabled. Only the venues in `changed` are rewritten, so every other slot
+    keeps the timestamp of its own last update.
+    """
+    if _shared_table is None:
+        return
+    with _shared_table.write() as table:
+        for (ex, pair), price in changed.items():
+            table.set_price(ex, pair, price, now_ts)
+        for pair, spreads in spreads_by_pair.items():
+            for short_lbl, val in spreads:
+                table.set_spread(pair, short_lbl, val, now_ts)
+
 
 def _format_price(p: float) -> str:
     return f"${p:,.2f}"
@@ -66,47 +129,118 @@ def _spread_label(a: str, b: str) -> str:
     return abbr.get((a, b), f"{a[:1]}-{b[:1]}")
 
 
+_COMBOS = [("Coinbase", "Kraken"), ("Coinbase", "Bitstamp"), ("Kraken", "Bitstamp")]
+
+
+def _compute_spreads(pair: str) -> list[tuple[str, float]]:
+    def get(ex: str):
+        return prices.get(ex, {}).get(pair)
+
+    spreads: list[tuple[str, float]] = []
+    for a, b in _COMBOS:
+        pa, pb = get(a), get(b)
+        if pa is not None and pb is not None:
+            spreads.append((_spread_label(a, b), pa - pb))
+    return spreads
+
+
+def _format_spreads(pair: str, spreads: list[tuple[str, float]]) -> str:
+    parts = []
+    for short_lbl, val in spreads:
+        sign = "+" if val >= 0 else "-"
+        parts.append(f"{short_lbl} {pair}: {sign}{abs(val):.2f}")
+    return " | ".join(parts)
+
+
 async def update_price(exchange: str, pair: str, price: float, side: Optional[str] = None):
     now_ts = datetime.now(tz=timezone.utc).timestamp()
 
     async with _lock:
         prices.setdefault(exchange, {})[pair] = price
-
-        def get(ex: str):
-            return prices.get(ex, {}).get(pair)
-
-        combos = [("Coinbase", "Kraken"), ("Coinbase", "Bitstamp"), ("Kraken", "Bitstamp")]
-        spreads: list[tuple[str, float]] = []
-
-        for a, b in combos:
-            pa, pb = get(a), get(b)
-            if pa is not None and pb is not None:
-                spreads.append((_spread_label(a, b), pa - pb))
+        spreads = _compute_spreads(pair)
+        _publish({(exchange, pair): price}, {pair: spreads}, now_ts)
 
         if not spreads:
             return
 
         triggered = False
-        parts = []
         for short_lbl, val in spreads:
             key = f"{pair}-{short_lbl}"
             if _suppressor.should_emit(key, val, now_ts):
                 triggered = True
-            sign = "+" if val >= 0 else "-"
-            parts.append(f"{short_lbl} {pair}: {sign}{abs(val):.2f}")
 
         if not triggered:
             return
 
         source = f"{exchange} {pair}" + (f" {side}" if side else "") + f" price {_format_price(price)}"
-        logger.info("💱 %s | Source update: %s", " | ".join(parts), source)
+        logger.info("💱 %s | Source update: %s", _format_spreads(pair, spreads), source)
+
+
+async def update_prices_batch(updates: list[tuple[str, str, float, Optional[str]]]):
+    """
+    Apply a batch of (exchange, pair, price, side) updates under a single lock.
+    Spreads are recomputed once per touched pair, and the last update for
+    that pair is reported as the source.
+    """
+    now_ts = datetime.now(tz=timezone.utc).timestamp()
+
+    async with _lock:
+        last_by_pair: dict[str, tuple[str, str, float, Optional[str]]] = {}
+        changed: dict[tuple[str, str], float] = {}
+        for exchange, pair, price, side in updates:
+            prices.setdefault(exchange, {})[pair] = price
+            last_by_pair[pair] = (exchange, pair, price, side)
+            changed[(exchange, pair)] = price
+
+        spreads_by_pair = {pair: _compute_spreads(pair) for pair in last_by_pair}
+        _publish(changed, spreads_by_pair, now_ts)
+
+        touched: list[tuple[str, list[tuple[str, float]]]] = []
+        keys: list[str] = []
+        values: list[float] = []
+        for pair, spreads in spreads_by_pair.items():
+            if not spreads:
+                continue
+            touched.append((pair, spreads))
+            for short_lbl, val in spreads:
+                keys.append(f"{pair}-{short_lbl}")
+                values.append(val)
+
+        if not touched:
+            return
 
+        emit = _suppressor.should_emit_many(keys, values, now_ts)
 
-async def price_update_dispatcher():
+        i = 0
+        for pair, spreads in touched:
+            triggered = any(emit[i:i + len(spreads)])
+            i += len(spreads)
+            if not triggered:
+                continue
+            exchange, _, price, side = last_by_pair[pair]
+            source = f"{exchange} {pair}" + (f" {side}" if side else "") + f" price {_format_price(price)}"
+            logger.info("💱 %s | Source update: %s", _format_spreads(pair, spreads), source)
+
+
+async def price_update_dispatcher(batched: bool = False, max_batch: int = 256, max_wait: float = 0.005):
     """
     Consume the price_update_queue and call update_price.
     EXPECTS tuples of (exchange, pair, price, side).
+
+    With batched=True, updates are drained in adaptive micro-batches
+    and applied through update_prices_batch.
     """
+    if batched:
+        batcher = AdaptiveBatcher(price_update_queue, max_size=max_batch, max_wait=max_wait)
+        while True:
+            batch = await batcher.next_batch()
+            try:
+                updates = [u for u in batch if isinstance(u, tuple) and len(u) == 4]
+                if updates:
+                    await update_prices_batch(updates)
+            finally:
+                batcher.done(batch)
+
     while True:
         try:
             exchange, pair, price, side = await price_update_queue.get()
@@ -4,6 +4,8 @@ import json
 import os
 from datetime import datetime, timezone
 
+from market_monitor.batching import AdaptiveBatcher
+
 # shared queues
 trade_queue: asyncio.Queue = asyncio.Queue()
 price_update_queue: asyncio.Queue = asyncio.Queue()
@@ -19,13 +21,49 @@ def _ensure_csv_header():
             writer.writerow(["exchange", "pair", "side", "price", "size", "timestamp", "received_at_utc"])
 
 
-async def trade_logger_and_updater():
+def _persist_batch(trades: list[tuple]):
+    """
+    Persist a batch of (received_at, (exchange, pair, side, price, size, timestamp))
+    entries with one CSV write and one JSONL write. received_at is the time each
+    trade was taken off the queue, so it matches what per-item mode records.
+    """
+    rows = []
+    lines = []
+    for received, (exchange, pair, side, price, size, timestamp) in trades:
+        received_at = received.isoformat()
+        rows.append([exchange, pair, side, price, size, timestamp, received_at])
+        record = {
+            "exchange": exchange,
+            "pair": pair,
+            "side": side,
+            "price": price,
+            "size": size,
+            "timestamp": timestamp,
+            "received_at": received_at,
+        }
+        lines.append(json.dumps(record) + "\n")
+
+    with open(CSV_FILE, "a", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerows(rows)
+    with open(JSONL_FILE, "a") as f:
+        f.write("".join(lines))
+
+
+async def trade_logger_and_updater(batched: bool = False, max_batch: int = 256, max_wait: float = 0.005):
     """
     Consume trades from trade_queue, persist to CSV/JSONL,
     and push price updates (exchange, pair, price, side) to price_update_queue.
+
+    With batched=True, trades are drained in adaptive micro-batches
+    (see AdaptiveBatcher) and each batch is persisted in a single write.
     """
     _ensure_csv_header()
 
+    if batched:
+        await _batched_trade_logger(max_batch, max_wait)
+        return
+
     while True:
         try:
             exchange, pair, side, price, size, timestamp = await trade_queue.get()
@@ -59,3 +97,23 @@ async def trade_logger_and_updater():
             pass
 
         trade_queue.task_done()
+
+
+async def _batched_trade_logger(max_batch: int, max_wait: float):
+    batcher = AdaptiveBatcher(trade_queue, max_size=max_batch, max_wait=max_wait, timestamped=True)
+
+    while True:
+        batch = await batcher.next_batch()
+        try:
+            trades = [(r, t) for r, t in batch if isinstance(t, tuple) and len(t) == 6]
+            if trades:
+                _persist_batch(trades)
+
+            # Notify spread monitor (non-blocking; drop if queue is full)
+            for _, (exchange, pair, side, price, size, timestamp) in trades:
+                try:
+                    price_update_queue.put_nowait((exchange, pair, price, side))
+                except asyncio.QueueFull:
+                    pass
+        finally:
+            batcher.done(batch)
@@ -0,0 +1,83 @@
+import asyncio
+import time
+import unittest
+
+from market_monitor import instrumentation
+from market_monitor.instrumentation import instrumented_task, task_stats
+
+
+class InstrumentedTaskTest(unittest.TestCase):
+    def setUp(self):
+        task_stats.clear()
+
+    def test_completes_with_result_and_stats(self):
+        async def worker():
+            for _ in range(3):
+                await asyncio.sleep(0)
+            return 42
+
+        async def main():
+            return await instrumented_task(worker(), "worker")
+
+        self.assertEqual(asyncio.run(main()), 42)
+        stats = task_stats["worker"]
+        self.assertEqual(stats.steps, 4)
+        self.assertEqual(stats.slow_steps, 0)
+        self.assertGreaterEqual(stats.cpu_time, 0.0)
+
+    def test_exception_propagates(self):
+        async def worker():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        async def main():
+            await instrumented_task(worker(), "failing")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(main())
+        self.assertEqual(task_stats["failing"].steps, 2)
+
+    def test_cancelled(self):
+        cleaned_up = []
+
+        async def worker():
+            try:
+                await asyncio.sleep(10)
+            finally:
+                cleaned_up.append(True)
+
+        async def main():
+            task = instrumented_task(worker(), "sleeper")
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return task
+
+        task = asyncio.run(main())
+        self.assertTrue(task.cancelled())
+        self.assertEqual(cleaned_up, [True])
+        self.assertEqual(task_stats["sleeper"].steps, 2)
+
+    def test_blocking_step_is_logged(self):
+        async def inner():
+            await asyncio.sleep(0)
+            time.sleep(0.03)
+
+        async def worker():
+            await inner()
+
+        async def main():
+            await instrumented_task(worker(), "blocker", slow_threshold=0.02)
+
+        with self.assertLogs(instrumentation.logger, "WARNING") as logs:
+            asyncio.run(main())
+        stats = task_stats["blocker"]
+        self.assertEqual(stats.slow_steps, 1)
+        self.assertGreaterEqual(stats.max_step, 0.03)
+        self.assertIn("blocker", logs.output[0])
+        self.assertIn("inner", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()